@@ -0,0 +1,74 @@
+"""
+Measures time and memory taken by the interpreter to hold a large amount of ayumu objects.
+
+Usage: python benchmarks/defines.py [amount of defines, default: 1000000] [repeated|unique|deleted ...]
+
+- repeated: every define reuses one of a handful of literals (best case for interning).
+- unique: every define has its own literal (worst case for interning).
+- deleted: unique defines which all get removed again with ':3'.
+"""
+import sys
+import time
+import tracemalloc
+
+from osaker.lexer import OsakerLexer
+from osaker.parser import OsakerParser
+
+LITERALS = [
+    '"localhost" ~nyan',
+    '"Osaka is inside this programming language..." ~nyan',
+    "8080 ~chiyo",
+    "1984 ~chiyo",
+    "yaa ~tomo",
+    "nuh ~tomo",
+]
+
+def generate_script(amount: int, case: str) -> str:
+    if case == "repeated":
+        return "\n".join(
+            f":o config_{index} <-- {LITERALS[index % len(LITERALS)]}" for index in range(amount)
+        )
+
+    script = "\n".join(
+        f':o config_{index} <-- "value number {index}" ~nyan' for index in range(amount)
+    )
+
+    if case == "deleted":
+        script += "\n" + "\n".join(f":3 config_{index}" for index in range(amount))
+
+    return script
+
+def run(amount: int, case: str) -> None:
+    lexer = OsakerLexer()
+    parser = OsakerParser()
+
+    start = time.perf_counter()
+    tokens = lexer.tokenize(generate_script(amount, case))
+    tokenize_elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    parser.parse(tokens)
+
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"[{case}]")
+    print(f"defines:          {amount:,}")
+    print(f"tokenize time:    {tokenize_elapsed:.2f}s")
+    print(f"parse time:       {elapsed:.2f}s (traced)")
+    print(f"globals memory:   {current / 1024 / 1024:.2f} MiB ({current / amount:.1f} bytes per define)")
+    print(f"peak memory:      {peak / 1024 / 1024:.2f} MiB")
+    print(f"interned objects: {len(parser._pool)}\n")
+
+def main() -> None:
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cases = sys.argv[2:] or ["repeated", "unique", "deleted"]
+
+    for case in cases:
+        run(amount, case)
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,29 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    ...
+    from typing import List
 
+import sys
 import typer
+import atexit
+import select
 import logging
 import readline
 import platform
 import traceback
+from pathlib import Path
 from devgoldyutils import Colours
 
 from . import __version__
 from .lexer import OsakerLexer
+from .budget import ExecutionBudget
 from .errors import OsakerError
 from .parser import OsakerParser
 from .logger import osaker_logger
+from .name_index import NameIndex
+
+HISTORY_FILE = Path.home() / ".osaker_history"
+HISTORY_LENGTH = 1000
 
 app = typer.Typer(
     pretty_exceptions_enable = False, 
@@ -31,13 +40,50 @@ def execute_code(
     command_input: Optional[str] = typer.Option(
         None, "-c", "-i", help = "Passes the text directly to the interpreter as osaker code."
     ),
-    debug: bool = typer.Option(False, help = "Log to the console useful information from the interpreter.")
+    debug: bool = typer.Option(False, help = "Log to the console useful information from the interpreter."),
+    max_statements: Optional[int] = typer.Option(
+        None, help = "Maximum amount of statements a run may execute."
+    ),
+    max_time: Optional[float] = typer.Option(
+        None, help = "Maximum wall-clock time in seconds a run may take."
+    ),
+    max_int_bits: Optional[int] = typer.Option(
+        None, help = "Maximum bit length of a ~chiyo."
+    ),
+    max_string_length: Optional[int] = typer.Option(
+        None, help = "Maximum length of a ~nyan."
+    ),
+    max_import_depth: Optional[int] = typer.Option(
+        None, help = "Maximum depth of nested module imports."
+    ),
+    max_modules: Optional[int] = typer.Option(
+        None, help = "Maximum amount of modules a run may import."
+    ),
+    max_memory: Optional[int] = typer.Option(
+        None, help = "Approximate maximum amount of bytes a run may allocate for values."
+    )
 ):
     if debug:
         osaker_logger.setLevel(logging.DEBUG)
 
+    limits = {
+        "max_statements": max_statements,
+        "max_time": max_time,
+        "max_int_bits": max_int_bits,
+        "max_string_length": max_string_length,
+        "max_import_depth": max_import_depth,
+        "max_modules": max_modules,
+        "max_memory": max_memory
+    }
+
+    budget = None
+
+    if any(limit is not None for limit in limits.values()):
+        budget = ExecutionBudget(**limits)
+
     lexer = OsakerLexer()
-    parser = OsakerParser()
+    name_index = NameIndex()
+    parser = OsakerParser(budget = budget, name_index = name_index)
 
     if file is not None:
         file_content = open(file, "r").read()
@@ -61,15 +107,35 @@ def execute_code(
 
         raise typer.Exit()
 
+    if not sys.stdin.isatty():
+        # Piped in code doesn't need a prompt per line, run all of it in one go.
+        lines = sys.stdin.read().splitlines()
+
+        interpret_code_and_handle_exceptions(
+            lexer = lexer,
+            parser = parser,
+            text = "\n".join(lines[:lines.index("exit")] if "exit" in lines else lines),
+            trace_on_error = debug,
+            keep_going = True
+        )
+
+        raise typer.Exit()
+
+    setup_readline(name_index)
+
     print(
         f"Osaker {__version__} [Python {platform.python_version()}] on '{platform.platform()}'\n" \
             "  Type \"exit\" to quite the REPL.\n"
     )
 
+    prompt = f"{Colours.PURPLE}>>>{Colours.RESET} "
+
     while True:
 
         try:
-            text = input(f"{Colours.PURPLE}>>>{Colours.RESET} ")
+            text = input(prompt)
+            # Lines that are already waiting (e.g. a pasted script) get interpreted together as one batch.
+            lines = text.splitlines() + read_pending_lines()
 
         except EOFError as e:
             osaker_logger.error(
@@ -82,29 +148,94 @@ def execute_code(
             print("")
             continue
 
-        if text == "exit":
+        should_exit = "exit" in lines
+
+        if should_exit:
+            lines = lines[:lines.index("exit")]
+
+        if lines:
+            interpret_code_and_handle_exceptions(
+                lexer = lexer,
+                parser = parser,
+                text = "\n".join(lines),
+                trace_on_error = debug,
+                keep_going = True
+            )
+
+        if should_exit:
             raise typer.Exit()
 
-        interpret_code_and_handle_exceptions(
-            lexer = lexer,
-            parser = parser,
-            text = text,
-            trace_on_error = debug
-        )
+def setup_readline(name_index: NameIndex) -> None:
+    matches: List[str] = []
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            matches[:] = name_index.complete(text)
+
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(" \t\n()+-*/<:~\"'")
+    readline.parse_and_bind("tab: complete")
+
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(write_history_file)
+
+def write_history_file() -> None:
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError as e:
+        osaker_logger.debug(f"Failed to save the REPL history! Error: {e}")
+
+def read_pending_lines() -> List[str]:
+    lines = []
+
+    while stdin_has_pending_input():
+
+        try:
+            lines.extend(input().splitlines())
+        except EOFError:
+            break
+
+    return lines
+
+def stdin_has_pending_input() -> bool:
+    try:
+        readable, _, _ = select.select([sys.stdin], [], [], 0)
+    except (OSError, ValueError): # select can't poll console input on Windows.
+        return False
+
+    return bool(readable)
 
 def interpret_code_and_handle_exceptions(
     lexer: OsakerLexer,
     parser: OsakerParser,
     text: str,
-    trace_on_error: bool
+    trace_on_error: bool,
+    keep_going: bool = False
 ) -> None:
-    try:
-        parser.parse(lexer.tokenize(text))
-
-    except OsakerError as e:
+    """
+    Interprets the text and logs any osaker errors. With ``keep_going`` an error only
+    skips the statement that raised it, like it would when typing the lines in one by one.
+    """
+    def handle_exception(e: OsakerError) -> None:
         if trace_on_error:
             print(traceback.format_exc())
 
         osaker_logger.error(
             f"{Colours.BOLD_RED}{e.__class__.__name__}:{Colours.RESET} {e}"
-        )
\ No newline at end of file
+        )
+
+    try:
+        parser.parse(
+            lexer.tokenize(text),
+            on_error = handle_exception if keep_going else None
+        )
+
+    except OsakerError as e:
+        handle_exception(e)
@@ -2,17 +2,48 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Optional
 
     from .osaka_type import OsakaType
 
+import weakref
 from dataclasses import dataclass
 
 __all__ = (
     "AyumuObject",
+    "AyumuPool",
 )
 
-@dataclass
+@dataclass(frozen = True)
 class AyumuObject():
+    __slots__ = ("type", "value", "__weakref__")
+
     type: OsakaType
-    value: Any
\ No newline at end of file
+    value: Any
+
+class AyumuPool():
+    """
+    Per-interpreter interning pool for literal ayumu objects.
+
+    Ayumu objects are immutable so identical literals (e.g. the same ~nyan string
+    defined thousands of times) can all point to a single instance. The pool only
+    holds weak references so literals are freed once nothing uses them anymore (e.g. after ':3').
+    """
+    def __init__(self) -> None:
+        # Keyed by the raw literal token text, which on its own already tells the literal's type apart.
+        self._literals: weakref.WeakValueDictionary[str, AyumuObject] = weakref.WeakValueDictionary()
+
+    def get(self, token_value: str) -> Optional[AyumuObject]:
+        return self._literals.get(token_value)
+
+    def intern(self, token_value: str, osaka_type: OsakaType, value: Any) -> AyumuObject:
+        ayumu_object = self._literals.get(token_value)
+
+        if ayumu_object is None:
+            ayumu_object = AyumuObject(type = osaka_type, value = value)
+            self._literals[token_value] = ayumu_object
+
+        return ayumu_object
+
+    def __len__(self) -> int:
+        return len(self._literals)
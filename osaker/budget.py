@@ -0,0 +1,104 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+import sys
+import time
+from dataclasses import dataclass, field
+
+from .errors import OsakerBudgetExceededError
+
+__all__ = (
+    "ExecutionBudget",
+)
+
+@dataclass
+class ExecutionBudget():
+    """
+    Resource limits for a single run of osaker code. Leave a limit as ``None`` to disable it.
+
+    The same budget is shared with every module imported during that run.
+    """
+    max_statements: Optional[int] = None
+    max_time: Optional[float] = None
+    """Maximum wall-clock time in seconds."""
+    max_int_bits: Optional[int] = None
+    max_string_length: Optional[int] = None
+    max_import_depth: Optional[int] = None
+    max_modules: Optional[int] = None
+    max_memory: Optional[int] = None
+    """Approximate ceiling in bytes for values created during the run."""
+
+    statements: int = field(default = 0, init = False, repr = False)
+    modules: int = field(default = 0, init = False, repr = False)
+    memory: int = field(default = 0, init = False, repr = False)
+    _deadline: Optional[float] = field(default = None, init = False, repr = False)
+
+    def start(self) -> None:
+        self.statements = 0
+        self.modules = 0
+        self.memory = 0
+        self._deadline = None
+
+        if self.max_time is not None:
+            self._deadline = time.perf_counter() + self.max_time
+
+    def count_statement(self) -> None:
+        self.statements += 1
+
+        if self.max_statements is not None and self.statements > self.max_statements:
+            raise OsakerBudgetExceededError(
+                f"This script executed more than {self.max_statements} statements!"
+            )
+
+        self.check_time()
+
+    def check_time(self) -> None:
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise OsakerBudgetExceededError(
+                f"This script ran for longer than {self.max_time} seconds!"
+            )
+
+    def enter_import(self, depth: int) -> None:
+        if self.max_import_depth is not None and depth > self.max_import_depth:
+            raise OsakerBudgetExceededError(
+                f"Modules can only be imported {self.max_import_depth} levels deep!"
+            )
+
+        self.modules += 1
+
+        if self.max_modules is not None and self.modules > self.max_modules:
+            raise OsakerBudgetExceededError(
+                f"This script imported more than {self.max_modules} modules!"
+            )
+
+    def check_int_bits(self, bits: int) -> None:
+        if self.max_int_bits is not None and bits > self.max_int_bits:
+            raise OsakerBudgetExceededError(
+                f"That ~chiyo needs at least {bits} bits, the limit is {self.max_int_bits} bits!"
+            )
+
+    def check_string_length(self, length: int) -> None:
+        if self.max_string_length is not None and length > self.max_string_length:
+            raise OsakerBudgetExceededError(
+                f"That ~nyan is {length} characters long, the limit is {self.max_string_length} characters!"
+            )
+
+    def allocate(self, value: Any) -> None:
+        if self.max_memory is None:
+            return
+
+        self.charge(sys.getsizeof(value))
+
+    def charge(self, size: int) -> None:
+        if self.max_memory is None:
+            return
+
+        self.memory += size
+
+        if self.memory > self.max_memory:
+            raise OsakerBudgetExceededError(
+                f"This script used more than roughly {self.max_memory} bytes of memory!"
+            )
@@ -5,6 +5,7 @@ __all__  = (
     "OsakerIncorrectTypeError",
     "OsakerNameError",
     "OsakerTypeError",
+    "OsakerBudgetExceededError",
 )
 
 class OsakerError(Exception):
@@ -27,4 +28,7 @@ class OsakerIncorrectTypeError(OsakerTypeError):
     ...
 
 class OsakerModuleDoesntExist(OsakerTypeError):
+    ...
+
+class OsakerBudgetExceededError(OsakerError):
     ...
\ No newline at end of file
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List, Set, Optional
+
+from bisect import bisect_left
+
+__all__ = (
+    "NameIndex",
+)
+
+class NameIndex():
+    """
+    Index of defined ayumu names and module namespaces, kept up to date by the parser
+    so prefix lookups (e.g. REPL tab completion) never scan the globals.
+
+    Adding and removing names is O(1), the sorted view used for prefix lookups
+    is only rebuilt on the next lookup after the names changed.
+    """
+    def __init__(self) -> None:
+        self._names: Set[str] = set()
+        self._sorted_names: Optional[List[str]] = None
+
+    def add(self, name: str) -> None:
+        if name not in self._names:
+            self._names.add(name)
+            self._sorted_names = None
+
+    def discard(self, name: str) -> None:
+        if name in self._names:
+            self._names.discard(name)
+            self._sorted_names = None
+
+    def complete(self, prefix: str) -> List[str]:
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._names)
+
+        names = self._sorted_names
+
+        matches = []
+        position = bisect_left(names, prefix)
+
+        while position < len(names) and names[position].startswith(prefix):
+            matches.append(names[position])
+            position += 1
+
+        return matches
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
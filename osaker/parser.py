@@ -2,9 +2,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Dict, List, Generator, Any, Type, Iterable, Tuple
+    from typing import Dict, List, Generator, Any, Type, Iterable, Optional, Tuple, Callable
 
 import random
+import logging
 from pprint import pformat
 from devgoldyutils import LoggerAdapter, Colours, short_str
 from pathlib import Path
@@ -14,7 +15,9 @@ from .token import Token
 from .lexer import OsakerLexer
 from .logger import osaker_logger
 from .osaka_type import OsakaType
-from .ayumu_object import AyumuObject
+from .budget import ExecutionBudget
+from .name_index import NameIndex
+from .ayumu_object import AyumuObject, AyumuPool
 from .errors import (
     OsakerSyntaxError, 
     OsakerError, 
@@ -22,7 +25,8 @@ from .errors import (
     OsakerParseError, 
     OsakerNameError,
     OsakerTypeError,
-    OsakerModuleDoesntExist
+    OsakerModuleDoesntExist,
+    OsakerBudgetExceededError
 )
 
 __all__ = (
@@ -31,31 +35,85 @@ __all__ = (
 
 logger = LoggerAdapter(osaker_logger, prefix = "Parser")
 
+STATEMENT_OPERATORS = ("OP_DEFINE", "OP_DELETE", "OP_INSPECT", "OP_IMPORT")
+
+MATH_PRECEDENCE = {
+    "PLUS": 1,
+    "MINUS": 1,
+    "TIMES": 2,
+    "DIVIDE": 2,
+    "NEGATE": 3,
+}
+
 class OsakerParser():
-    def __init__(self):
+    def __init__(
+        self,
+        pool: Optional[AyumuPool] = None,
+        budget: Optional[ExecutionBudget] = None,
+        import_depth: int = 0,
+        name_index: Optional[NameIndex] = None,
+        module_cache: Optional[Dict[Path, Dict[str, AyumuObject]]] = None
+    ):
         self._globals: Dict[str, AyumuObject] = {}
-
-    def parse(self, tokens: List[Token]) -> None:
-        logger.debug(f"Tokens --> {pformat(tokens)}")
+        self._pool = AyumuPool() if pool is None else pool
+        self._budget = budget
+        self._import_depth = import_depth
+        self._name_index = name_index
+        self._module_cache: Dict[Path, Dict[str, AyumuObject]] = {} if module_cache is None else module_cache
+        self._statement_index = 0
+
+    def parse(self, tokens: List[Token], on_error: Optional[Callable[[OsakerError], None]] = None) -> None:
+        """
+        Parses and runs the tokens. If ``on_error`` is given, errors raised by a statement get passed
+        to it and parsing carries on from the next statement, except for budget errors which always stop the run.
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        budget = self._budget
+
+        if debug:
+            logger.debug(f"Tokens --> {pformat(tokens)}")
+
+        if budget is not None and self._import_depth == 0:
+            budget.start()
 
         for index, token in enumerate(tokens):
 
-            if token.type == "OP_DEFINE":
-                self.__parse_define(tokens, index)
+            if token.type not in STATEMENT_OPERATORS:
+                continue
+
+            if budget is not None:
+                budget.count_statement()
+
+            self._statement_index = index
+
+            try:
+
+                if token.type == "OP_DEFINE":
+                    self.__parse_define(tokens, index)
+
+                elif token.type == "OP_DELETE":
+                    self.__parse_delete(tokens, index)
+
+                elif token.type == "OP_INSPECT":
+                    self.__parse_inspect(tokens, index)
 
-            elif token.type == "OP_DELETE":
-                self.__parse_delete(tokens, index)
+                elif token.type == "OP_IMPORT":
+                    self.__parse_import(tokens, index)
 
-            elif token.type == "OP_INSPECT":
-                self.__parse_inspect(tokens, index)
+            except OsakerBudgetExceededError:
+                raise
 
-            elif token.type == "OP_IMPORT":
-                self.__parse_import(tokens, index)
+            except OsakerError as e:
+                if on_error is None:
+                    raise
 
-        logger.debug(f"Globals --> {pformat(self._globals)}")
+                on_error(e)
+
+        if debug:
+            logger.debug(f"Globals --> {pformat(self._globals)}")
 
     def __parse_define(self, all_tokens: List[Token], index: int):
-        tokens: Generator[Token] = iter(all_tokens[index + 1:])
+        tokens = self.__tokens_after(all_tokens, index + 1)
 
         variable_token = self.__parse_name(
             tokens_after_operator = tokens,
@@ -73,22 +131,29 @@ class OsakerParser():
                     + self.__format_hint(hint_msg)
             )
 
-        value, osaka_type = self.__parse_literal_or_name(
+        ayumu_object = self.__parse_literal_or_name(
             tokens_after_operator = tokens,
             all_tokens = all_tokens,
             token_no_exist_error_message = "Assign, but assign what? A pipe bomb? You must " \
                 "declare the value you would like to assign after '<--'."
         )
 
-        ayumu_object = AyumuObject(
-            type = osaka_type,
-            value = value
-        )
+        if self._budget is not None:
+            self._budget.allocate(variable_token.value)
+
+        if self._name_index is not None:
+            overwritten = self._globals.get(variable_token.value)
+
+            if isinstance(overwritten, dict):
+                for name in overwritten:
+                    self._name_index.discard(variable_token.value + name)
+
+            self._name_index.add(variable_token.value)
 
         self._globals[variable_token.value] = ayumu_object
 
     def __parse_delete(self, tokens: List[Token], index: int):
-        tokens: Generator[Token] = iter(tokens[index + 1:])
+        tokens = self.__tokens_after(tokens, index + 1)
 
         name_token = self.__parse_name(
             tokens_after_operator = tokens,
@@ -101,10 +166,17 @@ class OsakerParser():
                 f"'{name_token.value}' is not present in memory! Maybe you already deleted it?"
             )
 
-        del self._globals[name_token.value]
+        deleted = self._globals.pop(name_token.value)
+
+        if self._name_index is not None:
+            self._name_index.discard(name_token.value)
+
+            if isinstance(deleted, dict):
+                for name in deleted:
+                    self._name_index.discard(name_token.value + name)
 
     def __parse_inspect(self, tokens: List[Token], index: int):
-        tokens: Generator[Token] = iter(tokens[index + 1:])
+        tokens = self.__tokens_after(tokens, index + 1)
 
         name_token = self.__parse_name(
             tokens_after_operator = tokens,
@@ -146,7 +218,7 @@ class OsakerParser():
             )
 
     def __parse_import(self, all_tokens: List[Token], index: int):
-        tokens: Generator[Token] = iter(all_tokens[index + 2:])
+        tokens = self.__tokens_after(all_tokens, index + 2)
 
         name_token = self.__parse_name(
             tokens_after_operator = tokens,
@@ -173,12 +245,12 @@ class OsakerParser():
                     + self.__format_hint(hint_msg)
             )
 
-        module, _ = self.__parse_literal_or_name(
+        module = self.__parse_literal_or_name(
             tokens_after_operator = tokens, 
             all_tokens = all_tokens,
             token_no_exist_error_message = "You need to assign a module path.",
             ignore_type = True
-        )
+        ).value
         
         next_token = next(tokens, None)
 
@@ -195,14 +267,50 @@ class OsakerParser():
         if not module.exists():
             raise OsakerModuleDoesntExist(f"The given module path: {module} doesn't exist.")
         
-        content = open(module, "r").read()
-        
-        parser = OsakerParser()
-        lexer = OsakerLexer()
+        module_path = module.resolve()
+        module_globals = self._module_cache.get(module_path)
+
+        if module_globals is None:
+
+            if self._budget is not None:
+                self._budget.enter_import(self._import_depth + 1)
+
+            content = open(module, "r").read()
+
+            parser = OsakerParser(
+                pool = self._pool,
+                budget = self._budget,
+                import_depth = self._import_depth + 1,
+                module_cache = self._module_cache
+            )
+            lexer = OsakerLexer()
+
+            parser.parse(lexer.tokenize(content))
+
+            module_globals = parser._globals
+            self._module_cache[module_path] = module_globals
+
+        namespace = name_token.value
 
-        parser.parse(lexer.tokenize(content))
+        if self._name_index is not None:
+            previous_module_globals = self._globals.get(namespace)
 
-        self._globals[f"{name_token.value}"] = parser._globals
+            if isinstance(previous_module_globals, dict):
+                for name in previous_module_globals:
+                    self._name_index.discard(namespace + name)
+
+            self._name_index.add(namespace)
+
+            for name, value in module_globals.items():
+                # Nested namespaces (e.g. "a!l!") can't be reached through "a!" so they're left out.
+                if isinstance(value, AyumuObject):
+                    self._name_index.add(namespace + name)
+
+        self._globals[namespace] = module_globals
+
+    def __tokens_after(self, all_tokens: List[Token], start: int) -> Generator[Token]:
+        # Walks the token list in place rather than slicing a copy of the rest of it for every statement.
+        return (all_tokens[index] for index in range(start, len(all_tokens)))
 
     def __parse_name(self, tokens_after_operator: Generator[Token], error_message: str) -> Token:
         next_token = next(tokens_after_operator, None)
@@ -218,7 +326,7 @@ class OsakerParser():
         all_tokens: List[Token], 
         token_no_exist_error_message: str,
         ignore_type: bool = False
-    ) -> Tuple[Any, OsakaType]:
+    ) -> AyumuObject:
         tokens = tokens_after_operator
 
         next_token = next(tokens, None)
@@ -236,23 +344,22 @@ class OsakerParser():
             )
 
         if next_token.type == "OP_MATH":
-            evaluated_answer = self.__parse_math(tokens, all_tokens)
+            evaluated_answer = self.__parse_math(tokens)
 
-            return evaluated_answer, OsakaType.CHIYO
+            return AyumuObject(type = OsakaType.CHIYO, value = evaluated_answer)
 
         elif next_token.type == "NAME":
-            ayumu_object = self.__get_ayumu_object_or_error(next_token)
-
-            return ayumu_object.value, ayumu_object.type
+            return self.__get_ayumu_object_or_error(next_token)
 
         literal_token = next_token
-        literal_token_osaka_type = OsakaType.from_python_type(self.__guess_literal_type(literal_token.value))
 
-        hint_representation = self.__tokens_to_string_representation(all_tokens, literal_token)
-        hint_msg = f"Did you mean: {hint_representation} " \
-            f"~{Colours.CLAY.apply(literal_token_osaka_type.name.lower())}"
+        # Identical literals are decoded and cast only once per interpreter.
+        ayumu_object = self._pool.get(literal_token.value)
 
-        value = self.__clean_token_value(literal_token.type, literal_token.value)
+        if ayumu_object is not None:
+            literal_token_osaka_type = ayumu_object.type
+        else:
+            literal_token_osaka_type = OsakaType.from_python_type(self.__guess_literal_type(literal_token.value))
 
         if not ignore_type:
             next_token = next(tokens, None)
@@ -264,7 +371,9 @@ class OsakerParser():
                     error_msg = "You must specify the type you expect to come out of that variable!\n"
 
                 raise OsakerSyntaxError(
-                    error_msg + self.__format_hint(hint_msg)
+                    error_msg + self.__format_hint(
+                        self.__literal_hint(all_tokens, literal_token, literal_token_osaka_type)
+                    )
                 )
 
             type_token = next_token
@@ -279,85 +388,284 @@ class OsakerParser():
                 )
 
             if not literal_token_osaka_type == osaka_type:
+                value = self.__clean_token_value(literal_token.type, literal_token.value)
+
                 raise OsakerIncorrectTypeError(
                     "Incorrect type was defined! The value " \
                         f"'{short_str(str(value))}' is not of type '{osaka_type.name}'!\n"
-                            + self.__format_hint(hint_msg)
+                            + self.__format_hint(
+                                self.__literal_hint(all_tokens, literal_token, literal_token_osaka_type)
+                            )
                 )
 
         else:
             osaka_type = literal_token_osaka_type
 
+        if ayumu_object is not None:
+            if self._budget is not None:
+                self.__check_literal_budget(ayumu_object.type, ayumu_object.value)
+
+            return ayumu_object
+
+        value = self.__clean_token_value(literal_token.type, literal_token.value)
         value = self.__cast_correct_type_or_error(value, osaka_type)
 
-        return value, osaka_type
+        if self._budget is not None:
+            self.__check_literal_budget(osaka_type, value)
+            self._budget.allocate(value)
+
+        return self._pool.intern(literal_token.value, osaka_type, value)
+
+    def __check_literal_budget(self, osaka_type: OsakaType, value: Any) -> None:
+        if osaka_type == OsakaType.CHIYO:
+            self._budget.check_int_bits(value.bit_length())
 
-    def __parse_math(self, tokens_after_operator: Generator[Token], all_tokens: Iterable[Token]) -> int:
+        elif osaka_type == OsakaType.NYAN:
+            self._budget.check_string_length(len(value))
+
+    def __parse_math(self, tokens_after_operator: Generator[Token]) -> int:
+        program = self.__compile_math(tokens_after_operator)
+
+        return self.__evaluate_math(program)
+
+    def __compile_math(self, tokens_after_operator: Generator[Token]) -> List[Tuple[str, Any]]:
+        """Compiles a math expression into postfix (RPN) instructions using the shunting-yard algorithm."""
         tokens = tokens_after_operator
 
-        left_number_value, left_number_osaka_type = self.__parse_literal_or_name(
-            tokens,
-            all_tokens,
-            token_no_exist_error_message = "After the math operator (':m') should follow a " \
-                "math expression containing ~chiyo types. \n" + self.__format_hint("Example: :o answer <-- :m 1 + 1 ~chiyo"),
-            ignore_type = True
-        )
+        program: List[Tuple[str, Any]] = []
+        operators: List[str] = []
 
-        if not left_number_osaka_type == OsakaType.CHIYO:
-            raise OsakerTypeError(
-                f"The ayumu object or literal '{short_str(str(left_number_value))}' " \
-                    "given for math is not of ~chiyo type!"
-            )
+        expect_operand = True
+        last_operand = None
 
-        next_token = next(tokens, None)
+        while True:
+            next_token = next(tokens, None)
 
-        if next_token is None or next_token.type not in ["PLUS", "MINUS", "TIMES", "DIVIDE"]:
-            raise OsakerSyntaxError(
-                "Do you not know how to do math, huh? Where the FUCK is your operator, HUH?!?! " \
-                    f"\nAn actual math operator (e.g. +, -, *, /) must be given after the literal ~chiyo '{left_number_value}'! \n" 
-                        + self.__format_hint("Like this mf: :m 1 + 1 ~chiyo")
-            )
+            if expect_operand:
+
+                if next_token is None or next_token.type == "TYPE" and not next_token.value.startswith("-"):
+                    if last_operand is None:
+                        raise OsakerSyntaxError(
+                            "After the math operator (':m') should follow a " \
+                                "math expression containing ~chiyo types. \n" + self.__format_hint("Example: :o answer <-- :m 1 + 1 ~chiyo")
+                        )
+
+                    raise OsakerSyntaxError(
+                        "Bro! Are you mad? After the actual math operator (e.g. +, -, *, /) " \
+                            "should follow another ~chiyo type. How dumb can you be?! Fucking hell man! " \
+                                "I ain't helping you this time."
+                    )
+
+                if next_token.type == "LPAREN":
+                    operators.append("LPAREN")
+                    continue
+
+                if next_token.type == "MINUS":
+                    operators.append("NEGATE")
+                    continue
+
+                if next_token.type == "TYPE":
+                    # The lexer reads "-x" as a type, here it can only be a negated name.
+                    operators.append("NEGATE")
+                    next_token = Token(
+                        type = "NAME",
+                        value = next_token.value[1:],
+                        line_number = next_token.line_number,
+                        character_number = next_token.character_number + 1
+                    )
+
+                if next_token.type == "LITERAL_NUMBER":
+                    program.append(("PUSH", self.__parse_math_number(next_token.value)))
+
+                elif next_token.type == "NAME":
+                    program.append(("LOAD", next_token))
+
+                elif next_token.type.startswith("LITERAL"):
+                    value = self.__clean_token_value(next_token.type, next_token.value)
+
+                    raise OsakerTypeError(
+                        f"The ayumu object or literal '{short_str(value)}' " \
+                            "given for math is not of ~chiyo type!"
+                    )
 
-        actual_math_operator = next_token
+                else:
+                    raise OsakerSyntaxError(
+                        f"Expected a ~chiyo literal, an ayumu object or '(' in that math expression but got a '{next_token.type}' token.\n"
+                            + self.__format_hint("Example: :o answer <-- :m (1 + 2) * -number_x ~chiyo")
+                    )
 
-        right_number_value, right_number_osaka_type = self.__parse_literal_or_name(
-            tokens,
-            all_tokens,
-            token_no_exist_error_message = "Bro! Are you mad? After the actual math operator (e.g. +, -, *, /) " \
-                "should follow another ~chiyo type. How dumb can you be?! Fucking hell man! " \
-                    "I ain't helping you this time.",
-            ignore_type = True
-        )
+                last_operand = next_token
+                expect_operand = False
+                continue
 
-        if not right_number_osaka_type == OsakaType.CHIYO:
-            raise OsakerTypeError(
-                f"The ayumu object or literal '{short_str(str(right_number_value))}' " \
-                    "given for math is not of ~chiyo type!"
-            )
+            if next_token is None:
+                raise OsakerSyntaxError(
+                    "You still need to define a type here!\n" 
+                        + self.__format_hint("Example: 123 ~chiyo")
+                )
 
-        next_token = next(tokens, None)
+            if next_token.type == "TYPE" and self.__is_type_token(next_token):
+                break
 
-        if next_token is None or not next_token.type == "TYPE":
-            raise OsakerSyntaxError(
-                "You still need to define a type here!\n" 
-                    + self.__format_hint("Example: 123 ~chiyo")
-            )
+            if next_token.type == "RPAREN":
+
+                while operators and operators[-1] != "LPAREN":
+                    program.append((operators.pop(), None))
+
+                if not operators:
+                    raise OsakerSyntaxError(
+                        "There's a ')' in that math expression that was never opened with a '('!"
+                    )
+
+                operators.pop()
+                continue
+
+            operator = next_token.type
+            operand_after_minus = None
+
+            if operator == "LITERAL_NUMBER" and next_token.value.startswith("-"):
+                # "1 -2" gets lexed as "1" and "-2" so we split it back up into a minus and a number.
+                operator = "MINUS"
+                operand_after_minus = ("PUSH", self.__parse_math_number(next_token.value[1:]))
+
+            elif operator == "TYPE" and next_token.value.startswith("-"):
+                # Same goes for "a -b", the lexer reads "-b" as a type.
+                operator = "MINUS"
+                operand_after_minus = (
+                    "LOAD",
+                    Token(
+                        type = "NAME",
+                        value = next_token.value[1:],
+                        line_number = next_token.line_number,
+                        character_number = next_token.character_number + 1
+                    )
+                )
 
-        if actual_math_operator.type == "PLUS":
-            return left_number_value + right_number_value
+            if operator not in MATH_PRECEDENCE:
+                raise OsakerSyntaxError(
+                    "Do you not know how to do math, huh? Where the FUCK is your operator, HUH?!?! " \
+                        f"\nAn actual math operator (e.g. +, -, *, /) must be given after '{last_operand.value}'! \n" 
+                            + self.__format_hint("Like this mf: :m 1 + 1 ~chiyo")
+                )
 
-        elif actual_math_operator.type == "MINUS":
-            return left_number_value - right_number_value
+            precedence = MATH_PRECEDENCE[operator]
 
-        elif actual_math_operator.type == "TIMES":
-            return left_number_value * right_number_value
+            while operators and operators[-1] != "LPAREN" and MATH_PRECEDENCE[operators[-1]] >= precedence:
+                program.append((operators.pop(), None))
 
-        elif actual_math_operator.type == "DIVIDE":
-            return left_number_value / right_number_value
+            operators.append(operator)
 
-        raise OsakerParseError(
-            "Wait what, that math operator doesn't exist but it does exist? WHAT!"
-        )
+            if operand_after_minus is not None:
+                program.append(operand_after_minus)
+                last_operand = next_token
+                continue
+
+            expect_operand = True
+
+        while operators:
+            operator = operators.pop()
+
+            if operator == "LPAREN":
+                raise OsakerSyntaxError(
+                    "You opened a '(' in that math expression but never closed it with a ')'!"
+                )
+
+            program.append((operator, None))
+
+        return program
+
+    def __is_type_token(self, type_token: Token) -> bool:
+        """Whether a TYPE token really is a type (e.g. '~chiyo' or '-chiyo') and not a negated name (e.g. '-b')."""
+        if type_token.value.startswith("~"):
+            return True
+
+        return self.__clean_token_value(type_token.type, type_token.value).upper() in OsakaType.__members__
+
+    def __parse_math_number(self, literal: str) -> int:
+        ayumu_object = self._pool.get(literal)
+
+        if ayumu_object is None:
+            value = self.__cast_correct_type_or_error(literal, OsakaType.CHIYO)
+            ayumu_object = self._pool.intern(literal, OsakaType.CHIYO, value)
+
+        if self._budget is not None:
+            self.__check_literal_budget(ayumu_object.type, ayumu_object.value)
+
+        return ayumu_object.value
+
+    def __evaluate_math(self, program: List[Tuple[str, Any]]) -> int:
+        budget = self._budget
+
+        stack: List[int] = []
+        push = stack.append
+
+        for instruction, argument in program:
+
+            if instruction == "PUSH":
+                push(argument)
+
+            elif instruction == "LOAD":
+                ayumu_object = self.__get_ayumu_object_or_error(argument)
+
+                if not ayumu_object.type == OsakaType.CHIYO:
+                    raise OsakerTypeError(
+                        f"The ayumu object or literal '{short_str(str(ayumu_object.value))}' " \
+                            "given for math is not of ~chiyo type!"
+                    )
+
+                push(ayumu_object.value)
+
+            elif instruction == "NEGATE":
+                stack[-1] = -stack[-1]
+
+            else:
+                right = stack.pop()
+                left = stack[-1]
+
+                checked_ints = budget is not None and isinstance(left, int) and isinstance(right, int)
+
+                if checked_ints:
+                    budget.check_time()
+
+                    # Checked before evaluating so a huge multiplication never even starts.
+                    left_bits, right_bits = left.bit_length(), right.bit_length()
+
+                    if instruction == "TIMES":
+                        # The smallest size the product can have, the real size gets checked after.
+                        budget.check_int_bits(left_bits + right_bits - 1)
+                        budget.charge((left_bits + right_bits) // 8)
+
+                    else:
+                        budget.charge((max(left_bits, right_bits) + 1) // 8)
+
+                if instruction == "PLUS":
+                    stack[-1] = left + right
+
+                elif instruction == "MINUS":
+                    stack[-1] = left - right
+
+                elif instruction == "TIMES":
+                    stack[-1] = left * right
+
+                elif instruction == "DIVIDE":
+
+                    if right == 0:
+                        raise OsakerError(
+                            "You can't divide by zero, not even Osaka would try that!"
+                        )
+
+                    stack[-1] = left // right
+
+                else:
+                    raise OsakerParseError(
+                        "Wait what, that math operator doesn't exist but it does exist? WHAT!"
+                    )
+
+                if checked_ints:
+                    budget.check_int_bits(stack[-1].bit_length())
+
+        # Every value computed above was already charged to the memory budget.
+        return stack[0]
 
     def __get_ayumu_object_or_error(self, name_token: Token) -> AyumuObject:
         ayumu_object = self._globals.get(name_token.value)
@@ -370,10 +678,17 @@ class OsakerParser():
 
         return ayumu_object
 
-    def __tokens_to_string_representation(self, tokens: Iterable[Token], token_to_stop_at: Token) -> str:
+    def __literal_hint(self, all_tokens: Iterable[Token], literal_token: Token, osaka_type: OsakaType) -> str:
+        hint_representation = self.__tokens_to_string_representation(all_tokens, literal_token)
+
+        return f"Did you mean: {hint_representation} " \
+            f"~{Colours.CLAY.apply(osaka_type.name.lower())}"
+
+    def __tokens_to_string_representation(self, tokens: List[Token], token_to_stop_at: Token) -> str:
         resp_string_list = []
 
-        for token in tokens:
+        # Starts at the statement being parsed so we don't echo back everything that came before it.
+        for token in self.__tokens_after(tokens, self._statement_index):
 
             # we pray this fucking works.
             if token.id == token_to_stop_at.id: